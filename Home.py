@@ -2,6 +2,7 @@
 
 import logging
 import os
+from pathlib import Path
 
 import streamlit as st
 from st_pages import Page, show_pages
@@ -18,11 +19,16 @@ show_pages(
 )
 
 
+@st.cache_resource
+def icon_svg() -> str:
+    """Read the page icon once per server process."""
+    return Path("assets/icon.svg").read_text(encoding="utf-8")
+
+
 def main() -> None:
-    with open("assets/icon.svg", "r") as svg_file:
-        st.header("Title")
-        st.subheader("Template for Streamlit by Xavier Collantes")
-        st.write(svg_file.read(), unsafe_allow_html=True)
+    st.header("Title")
+    st.subheader("Template for Streamlit by Xavier Collantes")
+    st.write(icon_svg(), unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,12 @@
 
 import streamlit as st
 
+# Hides the Streamlit menu and footer watermark.
+HIDE_MENU_CSS = """<style>
+        #MainMenu {visibility: hidden;}
+        footer {visibility: hidden;}
+        </style>"""
+
 
 class PageConfig:
     """Overridable Streamlit page config."""
@@ -24,8 +30,8 @@ class PageConfig:
         self.report_bug_link = report_bug_link
         self.about_link = about_link
 
-    def get_config(self) -> st.set_page_config:
-        """Return consistent Page Config for Streamlit."""
+    def get_config(self) -> None:
+        """Apply consistent Page Config for Streamlit."""
         menu_items_section = {}
 
         if self.help_link:
@@ -35,24 +41,18 @@ class PageConfig:
         if self.about_link:
             menu_items_section["About"] = self.about_link
 
-        return (
-            st.set_page_config(
-                self.page_title,
-                self.page_icon,
-                self.layout,
-                self.initial_sidebar_state,
-                menu_items=menu_items_section,
-            ),
-            # Remove watermark
-            st.markdown(
-                """<style>
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        </style>""",
-                unsafe_allow_html=True,
-            ),
+        st.set_page_config(
+            self.page_title,
+            self.page_icon,
+            self.layout,
+            self.initial_sidebar_state,
+            menu_items=menu_items_section,
         )
 
+        # Remove watermark. Streamlit drops elements a rerun doesn't emit, so
+        # this has to be rendered on every run rather than once per session.
+        st.markdown(HIDE_MENU_CSS, unsafe_allow_html=True)
+
 
 # Attributions
 
@@ -1,29 +1,78 @@
+from __future__ import annotations
+
 import datetime
-import json
+import functools
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
+import numpy as np
+import orjson
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import pyarrow as pa
 import streamlit as st
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # Set up authentication with Google Tasks API
 SCOPES = ["https://www.googleapis.com/auth/tasks.readonly"]
 
+# How long fetched API results are reused across reruns before refetching.
+CACHE_TTL_SECONDS = 300
+
+# Upper bound on concurrent task list fetches.
+MAX_FETCH_WORKERS = 16
+
+# Bars shown per category chart before the rest are grouped as "Other".
+MAX_BARS = 15
+
+# Largest page size the Tasks API allows for list calls.
+PAGE_SIZE = 100
+
+# Partial responses: only the fields process_tasks reads, plus the page token.
+TASK_LIST_FIELDS = "items(id,title),nextPageToken"
+TASK_FIELDS = "items(id,title,due,completed,notes,updated),nextPageToken"
+
+# Column types of the task table built by process_tasks.
+TASK_SCHEMA = pa.schema(
+    [
+        ("task_id", pa.string()),
+        ("title", pa.string()),
+        ("list_name", pa.string()),
+        ("list_id", pa.string()),
+        ("due_date", pa.string()),
+        ("completed_date", pa.string()),
+        ("notes", pa.string()),
+        ("created", pa.string()),
+    ]
+)
+
+# Keep string columns Arrow-backed when converting to pandas.
+ARROW_STRING_TYPES = {pa.string(): pd.StringDtype("pyarrow")}
+
+
+@functools.lru_cache(maxsize=1)
+def read_token_file():
+    """Read stored credentials from token.json once per process."""
+    return Path("token.json").read_bytes()
+
 
 def authenticate_google_api():
-    """Authenticate with Google API and return the service."""
+    """Authenticate with Google API and return the credentials."""
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
 
     # Check if token.json exists (for stored credentials)
     if os.path.exists("token.json"):
         creds = Credentials.from_authorized_user_info(
-            json.loads(open("token.json").read()), SCOPES
+            orjson.loads(read_token_file()), SCOPES
         )
 
     # If credentials don't exist or are invalid, authenticate
@@ -37,104 +86,240 @@ def authenticate_google_api():
         # Save credentials for future use
         with open("token.json", "w") as token:
             token.write(creds.to_json())
+        read_token_file.cache_clear()
+
+    return creds
+
+
+def build_service(creds):
+    """Build a Google Tasks service from credentials."""
+    from googleapiclient.discovery import build
 
-    # Build and return the service
     return build("tasks", "v1", credentials=creds)
 
 
-def get_task_lists(service):
+def list_all_pages(collection, request):
+    """Execute a list request, following nextPageToken across all pages."""
+    items = []
+    while request is not None:
+        response = request.execute()
+        items.extend(response.get("items", []))
+        request = collection.list_next(request, response)
+    return items
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_task_lists(_service):
     """Get all task lists."""
-    results = service.tasklists().list().execute()
-    return results.get("items", [])
+    tasklists = _service.tasklists()
+    request = tasklists.list(maxResults=PAGE_SIZE, fields=TASK_LIST_FIELDS)
+    return list_all_pages(tasklists, request)
 
 
 def get_tasks(service, task_list_id):
     """Get all tasks from a task list."""
-    results = (
-        service.tasks()
-        .list(tasklist=task_list_id, showCompleted=True, showHidden=True)
-        .execute()
+    tasks = service.tasks()
+    request = tasks.list(
+        tasklist=task_list_id,
+        showCompleted=True,
+        showHidden=True,
+        maxResults=PAGE_SIZE,
+        fields=TASK_FIELDS,
+    )
+    return list_all_pages(tasks, request)
+
+
+def tasks_to_frame(tasks, list_id, list_name):
+    """Convert the raw tasks of one task list into a DataFrame."""
+    # Skip tasks without titles (sometimes happens with deleted tasks)
+    tasks = [task for task in tasks if "title" in task]
+
+    # Build the table column by column straight into Arrow buffers
+    table = pa.table(
+        {
+            "task_id": [task.get("id", "") for task in tasks],
+            "title": [task["title"] for task in tasks],
+            "list_name": [list_name] * len(tasks),
+            "list_id": [list_id] * len(tasks),
+            "due_date": [task.get("due") for task in tasks],
+            "completed_date": [task.get("completed") for task in tasks],
+            "notes": [task.get("notes", "") for task in tasks],
+            "created": [task.get("updated", "") for task in tasks],
+        },
+        schema=TASK_SCHEMA,
     )
-    return results.get("items", [])
+    return table.to_pandas(types_mapper=ARROW_STRING_TYPES.get)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_task_frame(_service, task_list_id, list_name):
+    """Get the tasks of one task list as a DataFrame.
+
+    Only the DataFrame is cached; the raw task dicts are released once converted.
+    """
+    return tasks_to_frame(get_tasks(_service, task_list_id), task_list_id, list_name)
+
+
+def get_task_frames(creds, task_lists):
+    """Get a DataFrame of tasks for every task list concurrently."""
+    local = threading.local()
+
+    def fetch(task_list):
+        # httplib2 is not thread-safe, so each worker builds its own service
+        if not hasattr(local, "service"):
+            local.service = build_service(creds)
+        return get_task_frame(local.service, task_list["id"], task_list["title"])
+
+    # Workers need the script context to use the Streamlit cache
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_FETCH_WORKERS, len(task_lists)),
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx()),
+    ) as executor:
+        return list(executor.map(fetch, task_lists))
 
 
 @st.cache_data
-def process_tasks(all_tasks, all_lists):
-    """Process tasks into a pandas DataFrame."""
-    # Create a mapping of list IDs to names
-    list_names = {lst["id"]: lst["title"] for lst in all_lists}
-
-    data = []
-    for list_id, tasks in all_tasks.items():
-        list_name = list_names.get(list_id, "Unknown")
-
-        for task in tasks:
-            # Skip tasks without titles (sometimes happens with deleted tasks)
-            if "title" not in task:
-                continue
-
-            # Process dates
-            due_date = None
-            if "due" in task:
-                due_date = task["due"].split("T")[0]  # Extract just the date part
-
-            completed_date = None
-            if "completed" in task:
-                completed_date = task["completed"].split("T")[0]
-
-            # Calculate task status
-            if "completed" in task and task.get("completed"):
-                status = "Completed"
-            elif (
-                "due" in task
-                and datetime.datetime.strptime(due_date, "%Y-%m-%d").date()
-                < datetime.date.today()
-            ):
-                status = "Overdue"
-            else:
-                status = "Active"
-
-            # Add to data
-            data.append(
-                {
-                    "task_id": task.get("id", ""),
-                    "title": task.get("title", ""),
-                    "list_name": list_name,
-                    "list_id": list_id,
-                    "status": status,
-                    "due_date": due_date,
-                    "completed_date": completed_date,
-                    "notes": task.get("notes", ""),
-                    "created": task.get("updated", ""),
-                }
+def process_tasks(frames):
+    """Combine per-list task DataFrames and derive dates and status."""
+    df = pd.concat(frames, ignore_index=True, copy=False)
+
+    # Parse timestamps once, keeping just the (UTC) date part
+    for column in ["due_date", "completed_date"]:
+        df[column] = (
+            pd.to_datetime(
+                df[column], format="ISO8601", utc=True, errors="coerce", cache=True
             )
+            .dt.tz_localize(None)
+            .dt.floor("D")
+        )
 
-    return pd.DataFrame(data)
+    # Calculate task status
+    today = pd.Timestamp(datetime.date.today())
+    df["status"] = np.select(
+        [df["completed_date"].notna(), df["due_date"] < today],
+        ["Completed", "Overdue"],
+        default="Active",
+    )
+
+    # Low-cardinality columns used for filtering and grouping
+    return df.astype({"list_name": "category", "status": "category"})
+
+
+@st.cache_data(show_spinner=False)
+def status_pie_chart(status_counts: tuple) -> go.Figure:
+    """Build the status pie chart from (status, count) pairs."""
+    import plotly.express as px
+
+    return px.pie(
+        pd.DataFrame(status_counts, columns=["Status", "Count"]),
+        values="Count",
+        names="Status",
+        title="Task Status Distribution",
+        color_discrete_sequence=px.colors.qualitative.Set3,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def list_bar_chart(list_counts: tuple) -> go.Figure:
+    """Build the tasks per list bar chart from (list, count) pairs."""
+    import plotly.express as px
+
+    return px.bar(
+        pd.DataFrame(list_counts, columns=["List", "Count"]),
+        x="List",
+        y="Count",
+        title="Tasks per List",
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def completion_line_chart(completed_over_time: tuple) -> go.Figure:
+    """Build the completion line chart from (date, count) pairs."""
+    import plotly.express as px
+
+    return px.line(
+        pd.DataFrame(completed_over_time, columns=["Date", "Completed Tasks"]),
+        x="Date",
+        y="Completed Tasks",
+        title="Tasks Completed Over Time",
+        markers=True,
+    )
+
+
+def top_counts(counts, label):
+    """Keep the largest counts, folding the rest into a single "Other" row."""
+    top = counts.nlargest(MAX_BARS, "Count")
+    other = counts["Count"].sum() - top["Count"].sum()
+    if other:
+        top = pd.concat(
+            [top, pd.DataFrame({label: ["Other"], "Count": [other]})],
+            ignore_index=True,
+        )
+    return top
+
+
+@st.cache_data(show_spinner=False)
+def aggregate_tasks(df):
+    """Compute the dashboard chart aggregates for a task DataFrame."""
+    status_counts = (
+        df.groupby("status", sort=False, observed=True)
+        .size()
+        .rename_axis("Status")
+        .reset_index(name="Count")
+    )
+    list_counts = top_counts(
+        df.groupby("list_name", sort=False, observed=True)
+        .size()
+        .rename_axis("List")
+        .reset_index(name="Count"),
+        "List",
+    )
+
+    # Group by completion date and count; completed_date is already floored to
+    # the day, so group on its datetime64 values instead of .dt.date objects
+    completed_over_time = (
+        df.groupby("completed_date")
+        .size()
+        .rename_axis("Date")
+        .reset_index(name="Completed Tasks")
+    )
+
+    return {
+        "status_counts": status_counts,
+        "list_counts": list_counts,
+        "completed_over_time": completed_over_time,
+    }
 
 
 def create_dashboard(df):
     """Create a Streamlit dashboard to visualize task data."""
-    st.set_page_config(page_title="Google Tasks Dashboard", layout="wide")
-
     st.title("Google Tasks Dashboard")
 
-    # Sidebar filters
+    # Sidebar filters; categories are already sorted and unique
     st.sidebar.header("Filters")
 
     # Filter by task list
-    lists = ["All"] + sorted(df["list_name"].unique().tolist())
+    lists = ["All"] + df["list_name"].cat.categories.tolist()
     selected_list = st.sidebar.selectbox("Select Task List", lists)
 
     # Filter by status
-    statuses = ["All"] + sorted(df["status"].unique().tolist())
+    statuses = ["All"] + df["status"].cat.categories.tolist()
     selected_status = st.sidebar.selectbox("Select Status", statuses)
 
-    # Apply filters
-    filtered_df = df.copy()
+    # Apply filters as a single combined mask; categorical .values compare on
+    # their integer codes
+    masks = []
     if selected_list != "All":
-        filtered_df = filtered_df[filtered_df["list_name"] == selected_list]
+        masks.append(df["list_name"].values == selected_list)
     if selected_status != "All":
-        filtered_df = filtered_df[filtered_df["status"] == selected_status]
+        masks.append(df["status"].values == selected_status)
+    filtered_df = df.iloc[np.logical_and.reduce(masks)] if masks else df
+
+    # Charts reflect the selected filters; aggregates are reused across reruns
+    # until the filtered tasks change
+    aggregates = aggregate_tasks(filtered_df)
 
     # Create dashboard sections
     col1, col2 = st.columns(2)
@@ -142,58 +327,25 @@ def create_dashboard(df):
     # Tasks by status
     with col1:
         st.subheader("Tasks by Status")
-        status_counts = df["status"].value_counts().reset_index()
-        status_counts.columns = ["Status", "Count"]
-
-        fig = px.pie(
-            status_counts,
-            values="Count",
-            names="Status",
-            title="Task Status Distribution",
-            color_discrete_sequence=px.colors.qualitative.Set3,
-        )
+        status_counts = aggregates["status_counts"]
+        fig = status_pie_chart(tuple(status_counts.itertuples(index=False, name=None)))
         st.plotly_chart(fig)
 
     # Tasks by list
     with col2:
         st.subheader("Tasks by List")
-        list_counts = df["list_name"].value_counts().reset_index()
-        list_counts.columns = ["List", "Count"]
-
-        fig = px.bar(
-            list_counts,
-            x="List",
-            y="Count",
-            title="Tasks per List",
-            color_discrete_sequence=px.colors.qualitative.Pastel,
-        )
+        list_counts = aggregates["list_counts"]
+        fig = list_bar_chart(tuple(list_counts.itertuples(index=False, name=None)))
         st.plotly_chart(fig)
 
     # Task completion over time
     st.subheader("Task Completion Over Time")
 
-    # Convert date columns to datetime
-    df_time = df.copy()
-    df_time["completed_date"] = pd.to_datetime(df_time["completed_date"])
-    df_time["due_date"] = pd.to_datetime(df_time["due_date"])
-
-    # Group by completion date and count
-    completed_over_time = df_time.dropna(subset=["completed_date"])
-    completed_over_time = (
-        completed_over_time.groupby(completed_over_time["completed_date"].dt.date)
-        .size()
-        .reset_index()
-    )
-    completed_over_time.columns = ["Date", "Completed Tasks"]
-
     # Create the line chart
+    completed_over_time = aggregates["completed_over_time"]
     if not completed_over_time.empty:
-        fig = px.line(
-            completed_over_time,
-            x="Date",
-            y="Completed Tasks",
-            title="Tasks Completed Over Time",
-            markers=True,
+        fig = completion_line_chart(
+            tuple(completed_over_time.itertuples(index=False, name=None))
         )
         st.plotly_chart(fig)
     else:
@@ -201,14 +353,16 @@ def create_dashboard(df):
 
     # Upcoming tasks
     st.subheader("Upcoming Tasks")
-    upcoming_tasks = df[
-        (df["status"] == "Active") & (df["due_date"].notna())
-    ].sort_values("due_date")
+    upcoming_tasks = filtered_df.loc[
+        (filtered_df["status"] == "Active") & filtered_df["due_date"].notna(),
+        ["title", "list_name", "due_date"],
+    ].nsmallest(10, "due_date")
 
     if not upcoming_tasks.empty:
-        upcoming_tasks_display = upcoming_tasks[
-            ["title", "list_name", "due_date"]
-        ].head(10)
+        # Show dates without a time component
+        upcoming_tasks_display = upcoming_tasks.assign(
+            due_date=upcoming_tasks["due_date"].dt.date
+        )
         st.table(upcoming_tasks_display)
     else:
         st.write("No upcoming tasks with due dates")
@@ -218,15 +372,27 @@ def create_dashboard(df):
     if not filtered_df.empty:
         # Select and reorder columns for display
         display_cols = ["title", "list_name", "status", "due_date", "completed_date"]
-        st.dataframe(filtered_df[display_cols])
+        display_df = filtered_df[display_cols].assign(
+            due_date=filtered_df["due_date"].dt.date,
+            completed_date=filtered_df["completed_date"].dt.date,
+        )
+        st.dataframe(display_df)
     else:
         st.write("No tasks match the selected filters")
 
 
 def main():
+    # Page config must be the first Streamlit command, ahead of the sidebar
+    st.set_page_config(page_title="Google Tasks Dashboard", layout="wide")
+
     try:
         # Authenticate and get service
-        service = authenticate_google_api()
+        creds = authenticate_google_api()
+        service = build_service(creds)
+
+        # Drop cached API results so the next fetch hits Google again
+        if st.sidebar.button("Refresh"):
+            st.cache_data.clear()
 
         # Get all task lists
         task_lists = get_task_lists(service)
@@ -235,14 +401,11 @@ def main():
             st.error("No task lists found!")
             return
 
-        # Get tasks from each task list
-        all_tasks = {}
-        for task_list in task_lists:
-            tasks = get_tasks(service, task_list["id"])
-            all_tasks[task_list["id"]] = tasks
+        # Get tasks from each task list, one DataFrame per list
+        frames = get_task_frames(creds, task_lists)
 
         # Process tasks into DataFrame
-        df = process_tasks(all_tasks, task_lists)
+        df = process_tasks(frames)
 
         # Create dashboard
         create_dashboard(df)
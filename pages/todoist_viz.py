@@ -1,23 +1,59 @@
+from __future__ import annotations
+
 import datetime
+import hashlib
 import os
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import dotenv
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import pyarrow as pa
 import streamlit as st
-from todoist_api_python.api import TodoistAPI
 
 from components.page_config import PageConfig
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from todoist_api_python.api import TodoistAPI
+
 dotenv.load_dotenv()
 
 PageConfig().get_config()
 
 TODOIST_API_TOKEN: str | None = os.getenv("TODOIST_API_TOKEN")
 
+# Todoist priority value to display label (4=p1, 3=p2, 2=p3, 1=p4).
+PRIORITY_LABELS: dict[int, str] = {
+    4: "1 (Highest)",
+    3: "2 (High)",
+    2: "3 (Medium)",
+    1: "4 (Low)",
+}
+
+# Bars shown per category chart before the rest are grouped as "Other".
+MAX_BARS: int = 15
+
+# Column types of the task table built by process_tasks.
+TASK_SCHEMA: pa.Schema = pa.schema(
+    [
+        ("task_id", pa.string()),
+        ("title", pa.string()),
+        ("project_name", pa.string()),
+        ("project_id", pa.string()),
+        ("due_date", pa.string()),
+        ("completed_date", pa.string()),
+        ("description", pa.string()),
+        ("priority", pa.int64()),
+        ("created", pa.string()),
+    ]
+)
+
+# Keep string columns Arrow-backed when converting to pandas.
+ARROW_STRING_TYPES: dict[pa.DataType, pd.StringDtype] = {
+    pa.string(): pd.StringDtype("pyarrow")
+}
+
 
 def authenticate_todoist_api() -> TodoistAPI | None:
     """Authenticate with Todoist API and return the API client."""
@@ -37,6 +73,8 @@ def authenticate_todoist_api() -> TodoistAPI | None:
             st.warning("Please enter your Todoist API token to continue.")
             return None
 
+    from todoist_api_python.api import TodoistAPI
+
     # Create and return the API client
     return TodoistAPI(api_token)
 
@@ -62,86 +100,236 @@ def get_tasks(api: TodoistAPI, project_id: str | None = None) -> list[Any]:
         return []
 
 
+def tasks_cache_key(tasks: list[Any], projects: list[Any]) -> str:
+    """Digest every task and project field process_tasks reads."""
+    digest = hashlib.blake2b(digest_size=16)
+    for project in projects:
+        digest.update(repr((project.id, project.name)).encode())
+    for task in tasks:
+        digest.update(
+            repr(
+                (
+                    task.id,
+                    task.content,
+                    task.project_id,
+                    task.due.date if task.due else None,
+                    getattr(task, "completed_at", None),
+                    task.is_completed,
+                    getattr(task, "description", ""),
+                    task.priority,
+                    getattr(task, "created_at", ""),
+                )
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
 @st.cache_data
-def process_tasks(all_tasks: list[Any], all_projects: list[Any]) -> pd.DataFrame:
-    """Process tasks into a pandas DataFrame."""
+def process_tasks(
+    _all_tasks: list[Any], _all_projects: list[Any], cache_key: str
+) -> pd.DataFrame:
+    """Process tasks into a pandas DataFrame.
+
+    Streamlit skips hashing the underscore-prefixed task and project lists, so
+    results are cached on cache_key alone; see tasks_cache_key.
+    """
 
     # Create a mapping of project IDs to names.
-    project_names = {project.id: project.name for project in all_projects}
-
-    data: list[dict[str, Any]] = []
-    for task in all_tasks:
-
-        # Process dates.
-        due_date: str | None = None
-        if task.due:
-            due_date = task.due.date
-
-        completed_date = None
-        if hasattr(task, "completed_at") and task.completed_at:
-            completed_date = task.completed_at.split("T")[0]
-
-        # Calculate task status.
-        if task.is_completed:
-            status = "Completed"
-        elif (
-            due_date
-            and datetime.datetime.strptime(due_date, "%Y-%m-%d").date()
-            < datetime.date.today()
-        ):
-            status = "Overdue"
-        else:
-            status = "Active"
-
-        # Add to data.
-        data.append(
-            {
-                "task_id": task.id,
-                "title": task.content,
-                "project_name": project_names.get(task.project_id, "Unknown"),
-                "project_id": task.project_id,
-                "status": status,
-                "due_date": due_date,
-                "completed_date": completed_date,
-                "description": task.description if hasattr(task, "description") else "",
-                "priority": task.priority,
-                "created": task.created_at if hasattr(task, "created_at") else "",
-            }
+    project_names = {project.id: project.name for project in _all_projects}
+
+    # Build the table column by column straight into Arrow buffers.
+    table = pa.table(
+        {
+            "task_id": [task.id for task in _all_tasks],
+            "title": [task.content for task in _all_tasks],
+            "project_name": [
+                project_names.get(task.project_id, "Unknown") for task in _all_tasks
+            ],
+            "project_id": [task.project_id for task in _all_tasks],
+            "due_date": [task.due.date if task.due else None for task in _all_tasks],
+            "completed_date": [
+                getattr(task, "completed_at", None) or None for task in _all_tasks
+            ],
+            "description": [getattr(task, "description", "") for task in _all_tasks],
+            "priority": [task.priority for task in _all_tasks],
+            "created": [getattr(task, "created_at", "") for task in _all_tasks],
+        },
+        schema=TASK_SCHEMA,
+    )
+    df = table.to_pandas(types_mapper=ARROW_STRING_TYPES.get)
+
+    # Parse dates once, keeping just the (UTC) date part.
+    for column in ["due_date", "completed_date"]:
+        df[column] = (
+            pd.to_datetime(
+                df[column], format="ISO8601", utc=True, errors="coerce", cache=True
+            )
+            .dt.tz_localize(None)
+            .dt.floor("D")
+        )
+
+    # Calculate task status.
+    is_completed = np.array([task.is_completed for task in _all_tasks], dtype=bool)
+    today = pd.Timestamp(datetime.date.today())
+    df["status"] = np.select(
+        [is_completed, df["due_date"] < today],
+        ["Completed", "Overdue"],
+        default="Active",
+    )
+
+    # Low-cardinality columns used for filtering and grouping.
+    return df.astype({"project_name": "category", "status": "category"})
+
+
+@st.cache_data(show_spinner=False)
+def status_pie_chart(status_counts: tuple) -> go.Figure:
+    """Build the status pie chart from (status, count) pairs."""
+    import plotly.express as px
+
+    return px.pie(
+        pd.DataFrame(status_counts, columns=["Status", "Count"]),
+        values="Count",
+        names="Status",
+        title="Task status distribution",
+        color_discrete_sequence=px.colors.qualitative.Set3,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def project_bar_chart(project_counts: tuple) -> go.Figure:
+    """Build the tasks per project bar chart from (project, count) pairs."""
+    import plotly.express as px
+
+    return px.bar(
+        pd.DataFrame(project_counts, columns=["Project", "Count"]),
+        x="Project",
+        y="Count",
+        title="Tasks per Project",
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def priority_bar_chart(priority_counts: tuple) -> go.Figure:
+    """Build the priority bar chart from (priority, count) pairs in display order."""
+    import plotly.express as px
+
+    return px.bar(
+        pd.DataFrame(priority_counts, columns=["Priority", "Count"]),
+        x="Priority",
+        y="Count",
+        title="Tasks by Priority",
+        color="Priority",
+        color_discrete_sequence=px.colors.sequential.RdBu,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def completion_line_chart(completed_over_time: tuple) -> go.Figure:
+    """Build the completion line chart from (date, count) pairs."""
+    import plotly.express as px
+
+    return px.line(
+        pd.DataFrame(completed_over_time, columns=["Date", "Completed Tasks"]),
+        x="Date",
+        y="Completed Tasks",
+        title="Tasks Completed Over Time",
+        markers=True,
+    )
+
+
+def top_counts(counts: pd.DataFrame, label: str) -> pd.DataFrame:
+    """Keep the largest counts, folding the rest into a single "Other" row."""
+    top = counts.nlargest(MAX_BARS, "Count")
+    other = counts["Count"].sum() - top["Count"].sum()
+    if other:
+        top = pd.concat(
+            [top, pd.DataFrame({label: ["Other"], "Count": [other]})],
+            ignore_index=True,
         )
+    return top
+
+
+@st.cache_data(show_spinner=False)
+def aggregate_tasks(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Compute the dashboard chart aggregates for a task DataFrame."""
+    status_counts = (
+        df.groupby("status", sort=False, observed=True)
+        .size()
+        .rename_axis("Status")
+        .reset_index(name="Count")
+    )
+    project_counts = top_counts(
+        df.groupby("project_name", sort=False, observed=True)
+        .size()
+        .rename_axis("Project")
+        .reset_index(name="Count"),
+        "Project",
+    )
+
+    # Count in priority order.
+    priority_labels = df["priority"].map(PRIORITY_LABELS)
+    priority_counts = (
+        priority_labels.groupby(priority_labels, sort=False)
+        .size()
+        .reindex(list(PRIORITY_LABELS.values()), fill_value=0)
+        .rename_axis("Priority")
+        .reset_index(name="Count")
+    )
+
+    # Group by completion date and count; completed_date is already floored to
+    # the day, so group on its datetime64 values instead of .dt.date objects.
+    completed_over_time = (
+        df.groupby("completed_date")
+        .size()
+        .rename_axis("Date")
+        .reset_index(name="Completed Tasks")
+    )
 
-    return pd.DataFrame(data)
+    return {
+        "status_counts": status_counts,
+        "project_counts": project_counts,
+        "priority_counts": priority_counts,
+        "completed_over_time": completed_over_time,
+    }
 
 
 def create_dashboard(df: pd.DataFrame) -> None:
     """Create a Streamlit dashboard to visualize task data."""
     st.title("Todoist tasks")
 
-    # Sidebar filters.
+    # Sidebar filters; categories are already sorted and unique.
     st.sidebar.header("Filters")
 
     # Filter by project.
-    projects = ["All"] + sorted(df["project_name"].unique().tolist())
+    projects = ["All"] + df["project_name"].cat.categories.tolist()
     selected_project = st.sidebar.selectbox("Select Project", projects)
 
     # Filter by status.
-    statuses = ["All"] + sorted(df["status"].unique().tolist())
+    statuses = ["All"] + df["status"].cat.categories.tolist()
     selected_status = st.sidebar.selectbox("Select Status", statuses)
 
     # Filter by priority.
     priorities = ["All", "1 (Highest)", "2 (High)", "3 (Medium)", "4 (Low)"]
     selected_priority = st.sidebar.selectbox("Select Priority", priorities)
 
-    # Apply filters.
-    filtered_df = df.copy()
+    # Apply filters as a single combined mask; categorical .values compare on
+    # their integer codes.
+    masks = []
     if selected_project != "All":
-        filtered_df = filtered_df[filtered_df["project_name"] == selected_project]
+        masks.append(df["project_name"].values == selected_project)
     if selected_status != "All":
-        filtered_df = filtered_df[filtered_df["status"] == selected_status]
+        masks.append(df["status"].values == selected_status)
     if selected_priority != "All":
         priority_value = 5 - priorities.index(
             selected_priority
         )  # Convert to Todoist priority (4=p1, 3=p2, 2=p3, 1=p4)
-        filtered_df = filtered_df[filtered_df["priority"] == priority_value]
+        masks.append(df["priority"].values == priority_value)
+    filtered_df = df.iloc[np.logical_and.reduce(masks)] if masks else df
+
+    # Charts reflect the selected filters; aggregates are reused across reruns
+    # until the filtered tasks change.
+    aggregates = aggregate_tasks(filtered_df)
 
     # Create dashboard sections.
     col1, col2 = st.columns(2)
@@ -149,83 +337,33 @@ def create_dashboard(df: pd.DataFrame) -> None:
     # Tasks by status.
     with col1:
         st.subheader("Tasks by status")
-        status_counts = df["status"].value_counts().reset_index()
-        status_counts.columns = ["Status", "Count"]
-
-        fig = px.pie(
-            status_counts,
-            values="Count",
-            names="Status",
-            title="Task status distribution",
-            color_discrete_sequence=px.colors.qualitative.Set3,
-        )
+        status_counts = aggregates["status_counts"]
+        fig = status_pie_chart(tuple(status_counts.itertuples(index=False, name=None)))
         st.plotly_chart(fig)
 
     # Tasks by project.
     with col2:
         st.subheader("Tasks by project")
-        project_counts = df["project_name"].value_counts().reset_index()
-        project_counts.columns = ["Project", "Count"]
-
-        fig = px.bar(
-            project_counts,
-            x="Project",
-            y="Count",
-            title="Tasks per Project",
-            color_discrete_sequence=px.colors.qualitative.Pastel,
+        project_counts = aggregates["project_counts"]
+        fig = project_bar_chart(
+            tuple(project_counts.itertuples(index=False, name=None))
         )
         st.plotly_chart(fig)
 
     # Tasks by priority.
     st.subheader("Tasks by priority")
-    priority_map = {4: "1 (Highest)", 3: "2 (High)", 2: "3 (Medium)", 1: "4 (Low)"}
-    df_priority = df.copy()
-    df_priority["priority_label"] = df_priority["priority"].map(priority_map)
-    priority_counts = df_priority["priority_label"].value_counts().reset_index()
-    priority_counts.columns = ["Priority", "Count"]
-
-    # Sort by priority.
-    priority_order = ["1 (Highest)", "2 (High)", "3 (Medium)", "4 (Low)"]
-    priority_counts["Priority"] = pd.Categorical(
-        priority_counts["Priority"], categories=priority_order, ordered=True
-    )
-    priority_counts = priority_counts.sort_values("Priority")
-
-    fig = px.bar(
-        priority_counts,
-        x="Priority",
-        y="Count",
-        title="Tasks by Priority",
-        color="Priority",
-        color_discrete_sequence=px.colors.sequential.RdBu,
-    )
+    priority_counts = aggregates["priority_counts"]
+    fig = priority_bar_chart(tuple(priority_counts.itertuples(index=False, name=None)))
     st.plotly_chart(fig)
 
     # Task completion over time (if data available)
     st.subheader("Task Completion Over Time")
 
-    # Convert date columns to datetime
-    df_time = df.copy()
-    df_time["completed_date"] = pd.to_datetime(df_time["completed_date"])
-    df_time["due_date"] = pd.to_datetime(df_time["due_date"])
-
-    # Group by completion date and count
-    completed_over_time = df_time.dropna(subset=["completed_date"])
+    completed_over_time = aggregates["completed_over_time"]
     if not completed_over_time.empty:
-        completed_over_time = (
-            completed_over_time.groupby(completed_over_time["completed_date"].dt.date)
-            .size()
-            .reset_index()
-        )
-        completed_over_time.columns = ["Date", "Completed Tasks"]
-
         # Create the line chart
-        fig = px.line(
-            completed_over_time,
-            x="Date",
-            y="Completed Tasks",
-            title="Tasks Completed Over Time",
-            markers=True,
+        fig = completion_line_chart(
+            tuple(completed_over_time.itertuples(index=False, name=None))
         )
         st.plotly_chart(fig)
     else:
@@ -233,17 +371,16 @@ def create_dashboard(df: pd.DataFrame) -> None:
 
     # Upcoming tasks
     st.subheader("Upcoming Tasks")
-    upcoming_tasks = df[
-        (df["status"] == "Active") & (df["due_date"].notna())
-    ].sort_values("due_date")
+    upcoming_tasks = filtered_df.loc[
+        (filtered_df["status"] == "Active") & filtered_df["due_date"].notna(),
+        ["title", "project_name", "due_date", "priority"],
+    ].nsmallest(10, "due_date")
 
     if not upcoming_tasks.empty:
-        upcoming_tasks_display = upcoming_tasks[
-            ["title", "project_name", "due_date", "priority"]
-        ].head(10)
-        # Convert priority to readable format
-        upcoming_tasks_display["priority"] = upcoming_tasks_display["priority"].map(
-            priority_map
+        # Convert priority and due date to readable format
+        upcoming_tasks_display = upcoming_tasks.assign(
+            due_date=upcoming_tasks["due_date"].dt.date,
+            priority=upcoming_tasks["priority"].map(PRIORITY_LABELS),
         )
         st.table(upcoming_tasks_display)
     else:
@@ -254,8 +391,10 @@ def create_dashboard(df: pd.DataFrame) -> None:
     if not filtered_df.empty:
         # Select and reorder columns for display
         display_cols = ["title", "project_name", "status", "due_date", "priority"]
-        display_df = filtered_df[display_cols].copy()
-        display_df["priority"] = display_df["priority"].map(priority_map)
+        display_df = filtered_df[display_cols].assign(
+            due_date=filtered_df["due_date"].dt.date,
+            priority=filtered_df["priority"].map(PRIORITY_LABELS),
+        )
         st.dataframe(display_df)
     else:
         st.write("No tasks match the selected filters")
@@ -282,7 +421,7 @@ def main() -> None:
                 return
 
             # Process tasks into DataFrame.
-            df = process_tasks(tasks, projects)
+            df = process_tasks(tasks, projects, tasks_cache_key(tasks, projects))
 
             # Create dashboard
             create_dashboard(df)
@@ -1,8 +1,22 @@
 """Utils for checking passphrase."""
 
+import functools
+
 import streamlit as st
 
 
+@functools.lru_cache(maxsize=1)
+def get_passphrases():
+    """Load the configured passphrases once per process as a set."""
+    return frozenset(st.secrets.passphrases.p)
+
+
+@functools.lru_cache(maxsize=256)
+def is_valid_passphrase(passphrase):
+    """Checks whether the passphrase is one of the configured passphrases."""
+    return passphrase in get_passphrases()
+
+
 def is_auth(main, url_args):
     """Checks for URL args to match passphrase.
 
@@ -19,12 +33,10 @@ def is_auth(main, url_args):
         Renders either the given next authenticated function or an access denied
        visual.
     """
-    try:
-        if url_args["p"][0] in st.secrets.passphrases.p:
-            return main()
-        return access_denied()
-    except KeyError:
-        return access_denied()
+    passphrases = url_args.get("p")
+    if passphrases and is_valid_passphrase(passphrases[0]):
+        return main()
+    return access_denied()
 
 
 def access_denied():